@@ -1,9 +1,13 @@
 import streamlit as st
 import pandas as pd
-import glob
 import numpy as np
 import altair as alt 
 
+# Copy-on-Write：共用的主資料表只會被讀取，取欄位、切片都不會產生多餘的複製
+# (pandas 3 起 Copy-on-Write 是預設行為，這個選項已棄用，只在舊版 pandas 設定)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.options.mode.copy_on_write = True
+
 # --- 網頁的基本設定 (Layout 設為 "wide" 讓儀表板更寬) ---
 st.set_page_config(
     page_title="113年機車事故儀表板",
@@ -12,7 +16,18 @@ st.set_page_config(
 )
 
 # --- 1. 讀取「雲端」的 Parquet 檔案 ---
-@st.cache_data
+# (V10：Parquet 已經由 convert.py 分析好，這裡只讀需要的欄位)
+USED_COLUMNS = [
+    '發生小時', '發生月份', '發生星期', '時段 (週末/平日)',
+    '年齡層', '肇因', '天候', '性別', '縣市',
+    '發生地點', '號誌種類', '安全帽', '事故型態(子類別)', '事故型態(大類別)',
+    'lat', 'lon',
+]
+
+# 星期標籤 (發生星期 1-7 對應到 一-日)
+WEEKDAY_LABELS = ['一', '二', '三', '四', '五', '六', '日']
+
+@st.cache_resource
 def load_fast_data():
     
     # --- (V9 雲端版修改) ---
@@ -26,98 +41,169 @@ def load_fast_data():
     
     try:
         # 3. Pandas 可以直接從網址讀取 Parquet 檔！
-        df_full = pd.read_parquet(URL)
-        return df_full
+        #    (類別欄位、float32 經緯度等型態都會從 Parquet 還原)
+        df_motorcycle = pd.read_parquet(URL, engine="pyarrow", columns=USED_COLUMNS)
+        return df_motorcycle
     except Exception as e:
         st.error(f"從 Google Drive 讀取資料失敗：{e}")
-        st.error("請確認：1. 你的 FILE_ID 已正確填入。 2. 你的 Google Drive 檔案連結已設為「知道連結的任何人均可檢視」。")
+        st.error("請確認：1. 你的 FILE_ID 已正確填入。 2. 你的 Google Drive 檔案連結已設為「知道連結的任何人均可檢視」。 3. 上傳的是 convert.py 輸出的 Parquet 檔。")
         st.stop()
 
 
-# --- 2. 資料分析與處理 (V8 版) ---
-@st.cache_data
-def analyze_motorcycle_data(df):
-    # --- 篩選機車 ---
-    df_motorcycle = df[df['當事者區分-類別-大類別名稱-車種'].astype(str).str.contains('機車', na=False)].copy()
-
-    # --- 處理時間相關 ---
-    df_motorcycle['發生時間_num'] = pd.to_numeric(df_motorcycle['發生時間'], errors='coerce')
-    df_motorcycle = df_motorcycle.dropna(subset=['發生時間_num'])
-    df_motorcycle['發生小時'] = (df_motorcycle['發生時間_num'] // 10000).astype(int)
-    
-    df_motorcycle['發生日期_dt'] = pd.to_datetime(df_motorcycle['發生日期'], errors='coerce')
-    df_motorcycle = df_motorcycle.dropna(subset=['發生日期_dt']) 
-    df_motorcycle['發生月份'] = df_motorcycle['發生日期_dt'].dt.month
-    df_motorcycle['發生星期'] = df_motorcycle['發生日期_dt'].dt.dayofweek + 1  # 1(一) - 7(日)
-    
-    # --- Feature Engineering ---
-    df_motorcycle['時段 (週末/平日)'] = df_motorcycle['發生星期'].apply(lambda x: '週末 (六/日)' if x >= 6 else '平日 (一至五)')
-
-    # --- 處理「年齡」 (使用 V7 的短標籤) ---
-    df_motorcycle['年齡'] = pd.to_numeric(df_motorcycle['當事者事故發生時年齡'], errors='coerce')
-    df_motorcycle = df_motorcycle[df_motorcycle['年齡'].between(0, 99)]
-    bins = [0, 17, 24, 34, 44, 54, 64, 99]
-    labels = ['0-17歲', '18-24歲', '25-34歲', '35-44歲', '45-54歲', '55-64歲', '65+歲']
-    df_motorcycle['年齡層'] = pd.cut(df_motorcycle['年齡'], bins=bins, labels=labels, right=True)
-    
-    # --- 處理其他描述欄位 ---
-    df_motorcycle['肇因'] = df_motorcycle['肇因研判子類別名稱-主要'].fillna('未知')
-    df_motorcycle = df_motorcycle[
-        ~df_motorcycle['肇因'].isin(['無(非車輛駕駛人因素)', '尚未發現肇事因素'])
-    ]
-    
-    df_motorcycle['天候'] = df_motorcycle['天候名稱'].fillna('其他')
-    df_motorcycle['道路類型'] = df_motorcycle['道路型態大類別名稱'].fillna('其他')
-    df_motorcycle['性別'] = df_motorcycle['當事者屬-性-別名稱'].fillna('未知')
-    df_motorcycle['縣市'] = df_motorcycle['處理單位名稱警局層'].fillna('未知')
-    df_motorcycle['發生地點'] = df_motorcycle['發生地點'].fillna('未知')
-    df_motorcycle['號誌種類'] = df_motorcycle['號誌-號誌種類名稱'].fillna('未知')
-    df_motorcycle['安全帽'] = df_motorcycle['保護裝備名稱'].fillna('未知或無')
-    df_motorcycle['事故型態(子類別)'] = df_motorcycle['事故類型及型態子類別名稱'].fillna('未知')
-    df_motorcycle['事故型態(大類別)'] = df_motorcycle['事故類型及型態大類別名稱'].fillna('未知') 
-
-    # --- 處理經緯度 ---
-    df_motorcycle['lat'] = pd.to_numeric(df_motorcycle['緯度'], errors='coerce')
-    df_motorcycle['lon'] = pd.to_numeric(df_motorcycle['經度'], errors='coerce')
-    df_motorcycle = df_motorcycle.dropna(subset=['lat', 'lon'])
-
-    return df_motorcycle
-
-# --- 3. 建立網頁介面 (Dashboard) ---
-# (以下程式碼 V8 版都一樣，不用動)
+# --- 2. 建立網頁介面 (Dashboard) ---
 st.title("🏍️ (113年度機車事故)") 
 
-with st.spinner('正在從 Google Drive 讀取 33MB 資料... (第一次啟動會花 10-20 秒)'):
-    df_full_data = load_fast_data() 
-
-with st.spinner('正在分析機車事故資料...'):
-    df_motorcycle_data = analyze_motorcycle_data(df_full_data)
+with st.spinner('正在從 Google Drive 讀取資料... (第一次啟動會花幾秒鐘)'):
+    df_motorcycle_data = load_fast_data() 
 
 st.success(f"資料載入完成！共分析了 {len(df_motorcycle_data)} 筆機車事故。")
 
 # --- 側邊欄篩選器 ---
 st.sidebar.header("🔍 全域篩選器")
-all_cities = sorted(df_motorcycle_data['縣市'].unique())
+all_cities = sorted(df_motorcycle_data['縣市'].cat.categories)
 default_city = ['臺北市政府警察局'] if '臺北市政府警察局' in all_cities else [all_cities[0]]
 selected_cities = st.sidebar.multiselect("選擇縣市", options=all_cities, default=default_city)
 month_range = st.sidebar.slider("選擇月份範圍", 1, 12, (1, 12))
-weather_options = sorted(df_motorcycle_data['天候'].unique())
+weather_options = sorted(df_motorcycle_data['天候'].cat.categories)
 selected_weather = st.sidebar.multiselect("天候狀況", options=weather_options, default=weather_options)
 selected_period = st.sidebar.radio("選擇時段 (平日/週末)", options=['全部', '平日 (一至五)', '週末 (六/日)'], index=0)
 map_points_slider = st.sidebar.slider("地圖抽樣點數", 1000, 20000, 5000, 1000)
 
+# --- 共用的 numpy 陣列 ---
+# category 欄位取整數 code、數值欄位取原始陣列；篩選、統計都只比較整數，不用 hash 字串
+# 用 cache_resource 讓所有 session 共用同一份唯讀陣列，不會每次重跑都重新取
+@st.cache_resource
+def load_column_arrays(_df):
+    arrays = {}
+    for column in _df.columns:
+        values = _df[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            array = values.cat.codes.to_numpy()
+        else:
+            array = values.to_numpy()
+        array.flags.writeable = False
+        arrays[column] = array
+    # convert.py 會依發生日期排序；舊的 Parquet 或跨年度的資料月份不是遞增的，就不能用二分搜尋
+    month_is_sorted = bool(np.all(np.diff(arrays['發生月份']) >= 0))
+    return arrays, month_is_sorted
+
+column_arrays, month_is_sorted = load_column_arrays(df_motorcycle_data)
+
 # --- 套用所有篩選條件 ---
-filtered_data = df_motorcycle_data[
-    (df_motorcycle_data['縣市'].isin(selected_cities)) &
-    (df_motorcycle_data['發生月份'].between(month_range[0], month_range[1])) &
-    (df_motorcycle_data['天候'].isin(selected_weather))
-]
-if selected_period != '全部':
-    filtered_data = filtered_data[filtered_data['時段 (週末/平日)'] == selected_period]
-if filtered_data.empty:
+# st.cache_data 是所有 session 共用的；限制每個函式保留的筆數，篩選組合再多記憶體也不會一直長
+CACHE_MAX_ENTRIES = 64
+
+# 篩選結果 (列的位置) 依篩選器的值 cache 起來，只動「地圖抽樣點數」時不用重新篩選
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def get_filtered_index(cities, month_lo, month_hi, weather, period):
+    month = column_arrays['發生月份']
+    if month_is_sorted:
+        # 月份是遞增的，所以月份範圍就是一段連續的列，用二分搜尋找出頭尾
+        start, stop = np.searchsorted(month, [month_lo, month_hi + 1])
+        mask = True
+    else:
+        start, stop = 0, len(month)
+        mask = (month >= month_lo) & (month <= month_hi)
+
+    selected_city_codes = df_motorcycle_data['縣市'].cat.categories.get_indexer(cities)
+    selected_weather_codes = df_motorcycle_data['天候'].cat.categories.get_indexer(weather)
+    mask = (
+        mask &
+        np.isin(column_arrays['縣市'][start:stop], selected_city_codes) &
+        np.isin(column_arrays['天候'][start:stop], selected_weather_codes)
+    )
+    if period != '全部':
+        mask &= (column_arrays['時段 (週末/平日)'][start:stop] == df_motorcycle_data['時段 (週末/平日)'].cat.categories.get_loc(period))
+    return start + np.flatnonzero(mask)
+
+filter_key = (tuple(selected_cities), month_range[0], month_range[1], tuple(selected_weather), selected_period)
+filter_idx = get_filtered_index(*filter_key)
+if len(filter_idx) == 0:
     st.warning("在目前的篩選條件下，找不到任何資料！")
     st.stop()
-st.sidebar.info(f"篩選出 **{len(filtered_data)}** 筆資料")
+st.sidebar.info(f"篩選出 **{len(filter_idx)}** 筆資料")
+
+# --- 各圖表的統計 ---
+# 每個統計都用 filter_key 當 cache key，篩選條件沒變 (例如只改地圖點數) 就不會重新 groupby
+# (件數一律存成 int32，cache 與傳給圖表的資料都比較小)
+def get_filtered_column(filter_key, column):
+    return df_motorcycle_data[column].take(get_filtered_index(*filter_key))
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def count_by(filter_key, column, observed=True):
+    values = get_filtered_column(filter_key, column)
+    return values.groupby(values, observed=observed).size().astype('int32')
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def count_range(filter_key, column, lo, hi):
+    # 小時/月份/星期是值域很小的 int8，直接用 np.bincount 計數，不用 hash groupby
+    values = column_arrays[column][get_filtered_index(*filter_key)]
+    counts = np.bincount(values, minlength=hi + 1)[lo:hi + 1].astype(np.int32)
+    return pd.Series(counts, index=pd.RangeIndex(lo, hi + 1, name=column))
+
+# 各分頁要顯示「前 K 名」的 category 欄位
+TOP_K_COLUMNS = {
+    '發生地點': 10,
+    '事故型態(大類別)': 5,
+    '事故型態(子類別)': 5,
+    '號誌種類': 5,
+    '天候': 5,
+    '肇因': 5,
+}
+
+def top_k_from_codes(codes, categories, k, keep=None):
+    # 用 np.bincount 數每個類別的件數，再用 argpartition 取前 k 名 (取代 value_counts().head(k))
+    counts = np.bincount(codes[codes >= 0], minlength=len(categories))
+    if keep is not None:
+        counts[~keep] = 0
+    k = min(k, np.count_nonzero(counts))
+    top = np.argpartition(-counts, k)[:k] if k < len(counts) else np.arange(len(counts))
+    top = top[np.argsort(-counts[top], kind='stable')]
+    return pd.Series(counts[top].astype(np.int32), index=categories[top], name='count')
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def top_tables(filter_key):
+    # 一次算好所有分頁共用的前 K 名表
+    idx = get_filtered_index(*filter_key)
+    tables = {}
+    for column, k in TOP_K_COLUMNS.items():
+        categories = df_motorcycle_data[column].cat.categories.rename(column)
+        tables[column] = top_k_from_codes(column_arrays[column][idx], categories, k)
+
+    # 安全帽只看名稱有「帽」或是「未戴」的類別
+    helmet_categories = df_motorcycle_data['安全帽'].cat.categories.rename('安全帽')
+    is_helmet = helmet_categories.str.contains('帽', na=False) | (helmet_categories == '未戴')
+    tables['安全帽'] = top_k_from_codes(column_arrays['安全帽'][idx], helmet_categories, 5, keep=is_helmet)
+    return tables
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def cause_crosstab(filter_key, row_column):
+    # 只看前 5 大肇因；(列, 肇因) 兩個整數 code 合成一個，再用一次 np.bincount 算完整張表
+    top_5_causes = top_tables(filter_key)['肇因'].index
+    idx = get_filtered_index(*filter_key)
+
+    cause_categories = df_motorcycle_data['肇因'].cat.categories
+    top_codes = cause_categories.get_indexer(top_5_causes)
+    cause_rank = np.full(len(cause_categories), -1)
+    cause_rank[top_codes] = np.arange(len(top_codes))
+    cause_codes = column_arrays['肇因'][idx]
+    cause_idx = np.where(cause_codes >= 0, cause_rank[cause_codes], -1)  # code -1 (空值) 不能拿去查表
+
+    row_codes = column_arrays[row_column][idx]
+    if row_column == '發生星期':  # int8 的 1-7
+        row_codes, row_index = row_codes - 1, pd.RangeIndex(1, 8, name=row_column)
+    else:
+        row_index = df_motorcycle_data[row_column].cat.categories.rename(row_column)
+
+    keep = (cause_idx >= 0) & (row_codes >= 0)
+    flat = row_codes[keep].astype(np.intp) * len(top_codes) + cause_idx[keep]
+    counts = np.bincount(flat, minlength=len(row_index) * len(top_codes)).astype(np.int32)
+    return pd.DataFrame(counts.reshape(len(row_index), len(top_codes)), index=row_index, columns=top_5_causes)
+
+top_k = top_tables(filter_key)
+
+# 地圖抽樣用的亂數產生器
+rng = np.random.default_rng(0)
 
 # --- 建立分頁 ---
 tab_names = ["📊 事故趨勢", "🗺️ 地理分布", "👥 人口統計", "🔍 肇事分析", "🔥 交叉分析"]
@@ -129,24 +215,28 @@ with tab1:
     col1, col2 = st.columns(2)
     with col1:
         st.subheader("每月事故統計")
-        monthly_accidents = filtered_data.groupby('發生月份').size().reset_index(name='件數').set_index('發生月份')
+        monthly_accidents = count_range(filter_key, '發生月份', month_range[0], month_range[1]).reset_index(name='件數').set_index('發生月份')
         st.line_chart(monthly_accidents) 
         
     with col2:
         st.subheader("每週事故分布")
-        weekly_accidents = filtered_data.groupby('發生星期').size().reset_index(name='件數')
-        weekly_accidents['星期標籤'] = weekly_accidents['發生星期'].map({1: '一', 2: '二', 3: '三', 4: '四', 5: '五', 6: '六', 7: '日'})
+        # 圖表只需要已經彙總好的兩個欄位，其他欄位不要一起序列化給 Altair
+        weekly_counts = count_range(filter_key, '發生星期', 1, 7)
+        weekly_accidents = pd.DataFrame({
+            '星期標籤': pd.Categorical.from_codes(weekly_counts.index.to_numpy() - 1, categories=WEEKDAY_LABELS),
+            '件數': weekly_counts.to_numpy(),
+        })
         
         weekly_chart = alt.Chart(weekly_accidents).mark_bar().encode(
-            x=alt.X('星期標籤:O', title='星期', sort=['一', '二', '三', '四', '五', '六', '日'], 
+            x=alt.X('星期標籤:O', title='星期', sort=WEEKDAY_LABELS, 
                     axis=alt.Axis(labelAngle=0)), 
             y=alt.Y('件數:Q', title='事故件數'),
             tooltip=['星期標籤', '件數']
-        ).interactive()
+        )
         st.altair_chart(weekly_chart, use_container_width=True) 
     
     st.subheader(f"事故發生時段分析 ({selected_period}) (0-23點)")
-    hourly_accidents = filtered_data.groupby('發生小時').size().reset_index(name='件數').set_index('發生小時')
+    hourly_accidents = count_range(filter_key, '發生小時', 0, 23).reset_index(name='件數').set_index('發生小時')
     st.line_chart(hourly_accidents)
 
 # --- Tab 2: 地理分布 ---
@@ -154,21 +244,28 @@ with tab2:
     st.header(f"地理分布分析 ({selected_period})")
     st.subheader(f"事故熱點地圖 (隨機抽樣 {map_points_slider} 點)")
     
-    if len(filtered_data) > map_points_slider:
-        map_data = filtered_data[['lat', 'lon']].sample(map_points_slider)
+    # 先抽列的位置，再只取出抽到的經緯度 (不用先複製整份篩選後的資料)
+    if len(filter_idx) > map_points_slider:
+        map_idx = rng.choice(filter_idx, size=map_points_slider, replace=False)
     else:
-        map_data = filtered_data[['lat', 'lon']]
+        map_idx = filter_idx
+    # 經緯度存成 float32，但 st.map 算地圖中心時會把最大/最小值轉成 JSON，float32 會出錯；
+    # 只把抽到的點轉回 float64
+    map_data = pd.DataFrame({
+        'lat': column_arrays['lat'][map_idx].astype('float64'),
+        'lon': column_arrays['lon'][map_idx].astype('float64'),
+    })
     st.map(map_data, zoom=10)
     
     col1, col2 = st.columns(2)
     with col1:
         if len(selected_cities) > 1:
-            city_accidents = filtered_data.groupby('縣市').size().reset_index(name='件數').set_index('縣市').sort_values(by='件數', ascending=False)
+            city_accidents = count_by(filter_key, '縣市').reset_index(name='件數').set_index('縣市').sort_values(by='件數', ascending=False)
             st.subheader("各縣市事故件數")
             st.bar_chart(city_accidents)
     with col2:
         st.subheader(f"最常發生事故路段 (Top 10)")
-        dangerous_roads = filtered_data['發生地點'].value_counts().head(10)
+        dangerous_roads = top_k['發生地點']
         st.table(dangerous_roads) 
 
 # --- Tab 3: 人口統計 ---
@@ -178,7 +275,7 @@ with tab3:
     
     with col1:
         st.subheader("年齡層分布")
-        age_dist = filtered_data.groupby('年齡層').size().reset_index(name='件數')
+        age_dist = count_by(filter_key, '年齡層', observed=False).reset_index(name='件數')
         age_labels = ['0-17歲', '18-24歲', '25-34歲', '35-44歲', '45-54歲', '55-64歲', '65+歲']
         
         age_chart = alt.Chart(age_dist).mark_bar().encode(
@@ -186,26 +283,24 @@ with tab3:
                     axis=alt.Axis(labelAngle=0)), 
             y=alt.Y('件數:Q', title='事故件數'),
             tooltip=['年齡層', '件數']
-        ).interactive()
+        )
         st.altair_chart(age_chart, use_container_width=True) 
         
     with col2:
         st.subheader("性別分布")
-        gender_dist = filtered_data.groupby('性別').size().reset_index(name='件數')
+        gender_dist = count_by(filter_key, '性別').reset_index(name='件數')
         
         gender_chart = alt.Chart(gender_dist).mark_bar().encode(
             x=alt.X('性別:O', title='性別', 
                     axis=alt.Axis(labelAngle=0)), 
             y=alt.Y('件數:Q', title='事故件數'),
             tooltip=['性別', '件數']
-        ).interactive()
+        )
         st.altair_chart(gender_chart, use_container_width=True) 
 
     st.divider() 
     st.subheader("⛑️ 保護裝備 (安全帽) 分析")
-    helmet_data = filtered_data[filtered_data['安全帽'].str.contains('帽', na=False) | (filtered_data['安全帽'] == '未戴')]
-    helmet_counts = helmet_data['安全帽'].value_counts().head(5)
-    st.bar_chart(helmet_counts, horizontal=True) 
+    st.bar_chart(top_k['安全帽'], horizontal=True) 
 
 # --- Tab 4: 肇事原因 ---
 with tab4:
@@ -213,21 +308,21 @@ with tab4:
     col1, col2 = st.columns(2)
     with col1:
         st.subheader("事故碰撞對象 (大類別)")
-        type_major_counts = filtered_data['事故型態(大類別)'].value_counts().head(5)
+        type_major_counts = top_k['事故型態(大類別)']
         st.bar_chart(type_major_counts, horizontal=True) 
     with col2:
         st.subheader("事故型態 (怎麼撞的？)")
-        type_minor_counts = filtered_data['事故型態(子類別)'].value_counts().head(5)
+        type_minor_counts = top_k['事故型態(子類別)']
         st.bar_chart(type_minor_counts, horizontal=True) 
     st.divider()
     col3, col4 = st.columns(2)
     with col3:
         st.subheader("號誌種類分析")
-        signal_counts = filtered_data['號誌種類'].value_counts().head(5)
+        signal_counts = top_k['號誌種類']
         st.bar_chart(signal_counts, horizontal=True) 
     with col4:
         st.subheader("天候狀況分析")
-        weather_accidents = filtered_data['天候'].value_counts().head(5) 
+        weather_accidents = top_k['天候'] 
         st.bar_chart(weather_accidents, horizontal=True) 
 
 # --- Tab 5: 交叉分析 ---
@@ -237,13 +332,7 @@ with tab5:
     st.subheader("肇事原因 vs 年齡層 (熱力圖)")
     st.info("這張圖顯示了：在特定年齡層中，各種肇事原因所佔的「件數」。")
     
-    top_5_causes = filtered_data['肇因'].value_counts().head(5).index
-    df_top5_causes = filtered_data[filtered_data['肇因'].isin(top_5_causes)]
-    
-    crosstab_df = pd.crosstab(
-        df_top5_causes['年齡層'],
-        df_top5_causes['肇因']
-    )
+    crosstab_df = cause_crosstab(filter_key, '年齡層')
     crosstab_melted = crosstab_df.reset_index().melt(id_vars='年齡層', var_name='肇因', value_name='件數')
     
     age_labels_heatmap = ['0-17歲', '18-24歲', '25-34歲', '35-44歲', '45-54歲', '55-64歲', '65+歲']
@@ -252,7 +341,7 @@ with tab5:
         y=alt.Y('肇因:O', title='肇事原因'),
         color=alt.Color('件數:Q', title='事故件數'),
         tooltip=['年齡層', '肇因', '件數']
-    ).interactive()
+    )
     
     st.altair_chart(heatmap, use_container_width=True)
     
@@ -261,23 +350,21 @@ with tab5:
     st.subheader("肇事原因 vs 星期 (熱力圖)")
     st.info("這張圖顯示了：在一週的哪一天，哪些肇事原因特別多。")
 
-    crosstab_weekday_df = pd.crosstab(
-        filtered_data['發生星期'],
-        filtered_data['肇因']
-    )
-    crosstab_weekday_df = crosstab_weekday_df[top_5_causes]
+    crosstab_weekday_df = cause_crosstab(filter_key, '發生星期')
     
-    weekday_map = {1: '一', 2: '二', 3: '三', 4: '四', 5: '五', 6: '六', 7: '日'}
-    crosstab_weekday_df.index = crosstab_weekday_df.index.map(weekday_map)
+    crosstab_weekday_df.index = pd.CategoricalIndex(
+        pd.Categorical.from_codes(crosstab_weekday_df.index.to_numpy() - 1, categories=WEEKDAY_LABELS),
+        name='發生星期'
+    )
     
     crosstab_weekday_melted = crosstab_weekday_df.reset_index().melt(id_vars='發生星期', var_name='肇因', value_name='件數')
     
     heatmap_weekday = alt.Chart(crosstab_weekday_melted).mark_rect().encode(
-        x=alt.X('發生星期:O', title='星期', sort=['一', '二', '三', '四', '五', '六', '日'], 
+        x=alt.X('發生星期:O', title='星期', sort=WEEKDAY_LABELS, 
                 axis=alt.Axis(labelAngle=0)), 
         y=alt.Y('肇因:O', title='肇事原因'),
         color=alt.Color('件數:Q', title='事故件數'),
         tooltip=['發生星期', '肇因', '件數']
-    ).interactive()
+    )
     
     st.altair_chart(heatmap_weekday, use_container_width=True)
\ No newline at end of file
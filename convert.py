@@ -0,0 +1,167 @@
+import glob
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+# Copy-on-Write：篩選後再新增欄位時，只有真的被改到的欄位才會複製
+# (pandas 3 起 Copy-on-Write 是預設行為，這個選項已棄用，只在舊版 pandas 設定)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.options.mode.copy_on_write = True
+
+# --- 設定 ---
+# 原始資料：從政府開放資料下載的 113 年交通事故 CSV (可能分成好幾個檔案)
+RAW_CSV_PATTERN = "raw_data/*.csv"
+
+# 用來判斷是不是機車的欄位
+VEHICLE_COLUMN = '當事者區分-類別-大類別名稱-車種'
+
+# 分析時會用到的原始欄位 (其餘欄位讀 CSV 時直接略過)
+RAW_COLUMNS = [
+    VEHICLE_COLUMN, '發生時間', '發生日期', '當事者事故發生時年齡',
+    '肇因研判子類別名稱-主要', '天候名稱', '道路型態大類別名稱', '當事者屬-性-別名稱',
+    '處理單位名稱警局層', '發生地點', '號誌-號誌種類名稱', '保護裝備名稱',
+    '事故類型及型態子類別名稱', '事故類型及型態大類別名稱', '緯度', '經度',
+]
+
+# 輸出：已經分析好的 Parquet 檔 (上傳到 Google Drive 給 app.py 讀取)
+OUTPUT_PARQUET = "all_accidents_data.parquet"
+
+# 儀表板實際會用到的欄位 (其他原始欄位不寫進 Parquet)
+OUTPUT_COLUMNS = [
+    '發生小時', '發生月份', '發生星期', '時段 (週末/平日)',
+    '年齡層', '肇因', '天候', '道路類型', '性別', '縣市',
+    '發生地點', '號誌種類', '安全帽', '事故型態(子類別)', '事故型態(大類別)',
+    'lat', 'lon',
+]
+
+# 描述欄位：(儀表板欄位, 原始欄位, 空值時的預設值)
+DESCRIPTION_COLUMNS = [
+    ('天候', '天候名稱', '其他'),
+    ('道路類型', '道路型態大類別名稱', '其他'),
+    ('性別', '當事者屬-性-別名稱', '未知'),
+    ('縣市', '處理單位名稱警局層', '未知'),
+    ('發生地點', '發生地點', '未知'),
+    ('號誌種類', '號誌-號誌種類名稱', '未知'),
+    ('安全帽', '保護裝備名稱', '未知或無'),
+    ('事故型態(子類別)', '事故類型及型態子類別名稱', '未知'),
+    ('事故型態(大類別)', '事故類型及型態大類別名稱', '未知'),
+]
+
+# 轉成 category 的文字欄位
+CATEGORY_COLUMNS = [
+    '縣市', '天候', '道路類型', '性別', '安全帽', '肇因', '發生地點',
+    '事故型態(大類別)', '事故型態(子類別)', '號誌種類',
+]
+
+
+# --- 1. 讀取並合併原始 CSV (用 pyarrow 讀成 Arrow Table) ---
+def load_raw_data():
+    files = sorted(glob.glob(RAW_CSV_PATTERN))
+    if not files:
+        raise FileNotFoundError(f"找不到原始資料：{RAW_CSV_PATTERN}")
+    # 車種、日期、時間、年齡、經緯度固定讀成字串，避免不同檔案推測出不同型態 (例如某個檔案
+    # 年齡有「不詳」就會變成字串，合併時跟 int64 衝突)；數值欄位之後用 pd.to_numeric 轉換
+    string_columns = [VEHICLE_COLUMN, '發生日期', '發生時間', '當事者事故發生時年齡', '緯度', '經度']
+    convert_options = pacsv.ConvertOptions(
+        include_columns=RAW_COLUMNS,
+        column_types={column: pa.string() for column in string_columns},
+        strings_can_be_null=True,  # 空白欄位讀成 null (跟 pd.read_csv 一樣)，後面的 fillna 預設值才會生效
+    )
+    tables = [pacsv.read_csv(f, convert_options=convert_options) for f in files]
+    return pa.concat_tables(tables, promote_options="default")
+
+
+# --- 2. 資料分析與處理 (V8 版，從 app.py 搬過來，只在轉檔時跑一次) ---
+def analyze_motorcycle_data(table):
+    # --- 篩選機車 (在 Arrow 上用 match_substring，不用先 astype(str) 再逐筆 str.contains) ---
+    is_motorcycle = pc.match_substring(table[VEHICLE_COLUMN], '機車')
+    # 只有篩選後的列才轉成 pandas；文字欄位維持 Arrow 字串，不轉成 Python object
+    df_motorcycle = table.filter(is_motorcycle).to_pandas(
+        types_mapper={pa.string(): pd.ArrowDtype(pa.string())}.get
+    )
+
+    # --- 一次算出要保留的列 ---
+    # 時間、日期、年齡、經緯度都要能解析，肇因也要是駕駛人因素；全部合成一個 mask 只篩一次
+    time_num = pd.to_numeric(df_motorcycle['發生時間'], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+    hour = time_num // 10000  # 發生時間是 HHMMSS
+    # 發生日期是 YYYYMMDD 字串；指定格式就不用逐筆猜格式，cache=True 讓重複的日期只解析一次
+    date = pd.to_datetime(df_motorcycle['發生日期'], format='%Y%m%d', errors='coerce', cache=True)
+    age = pd.to_numeric(df_motorcycle['當事者事故發生時年齡'], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+    lat = pd.to_numeric(df_motorcycle['緯度'], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+    lon = pd.to_numeric(df_motorcycle['經度'], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+    cause = df_motorcycle['肇因研判子類別名稱-主要'].fillna('未知')
+
+    keep = (
+        (hour >= 0) & (hour <= 23) &  # 格式錯誤的時間轉成 int8 會溢位，app.py 的 bincount 也只數 0-23
+        date.notna().to_numpy(dtype=bool) &
+        (age >= 0) & (age <= 99) &  # NaN 比較的結果都是 False
+        ~cause.isin(['無(非車輛駕駛人因素)', '尚未發現肇事因素']).to_numpy(dtype=bool) &
+        ~np.isnan(lat) & ~np.isnan(lon)
+    )
+    df_motorcycle = df_motorcycle[keep]
+    date = date[keep]
+
+    # --- 處理時間相關 (都從已經篩好的陣列算) ---
+    df_motorcycle['發生小時'] = hour[keep].astype('int8')
+    df_motorcycle['發生日期_dt'] = date.to_numpy()
+    # 小時/月份/星期的值域都很小，存成 int8 (app.py 用 np.bincount 計數)
+    df_motorcycle['發生月份'] = date.dt.month.to_numpy(dtype='int8')
+    weekday = (date.dt.dayofweek + 1).to_numpy(dtype='int8')  # 1(一) - 7(日)
+    df_motorcycle['發生星期'] = weekday
+
+    # --- Feature Engineering ---
+    # 週末判斷一次用 numpy 比較完成 (不再逐筆呼叫 lambda)，直接存成固定兩類的 category
+    df_motorcycle['時段 (週末/平日)'] = pd.Categorical.from_codes(
+        (weekday >= 6).astype('int8'),
+        categories=['平日 (一至五)', '週末 (六/日)']
+    )
+
+    # --- 處理「年齡」 (使用 V7 的短標籤) ---
+    # 每個年齡層的上界 (含)；用二分搜尋直接算出 category code，不用 pd.cut 建 IntervalIndex
+    age_edges = np.array([17, 24, 34, 44, 54, 64, 99])
+    labels = ['0-17歲', '18-24歲', '25-34歲', '35-44歲', '45-54歲', '55-64歲', '65+歲']
+    age_codes = np.searchsorted(age_edges, age[keep], side='left').astype('int8')
+    df_motorcycle['年齡層'] = pd.Categorical.from_codes(age_codes, categories=labels, ordered=True)
+
+    # --- 處理其他描述欄位 ---
+    df_motorcycle['肇因'] = cause[keep]
+    # 文字欄位是 Arrow 字串，fillna 會直接交給 Arrow 的 fill_null 處理
+    # (load_raw_data 用 strings_can_be_null=True 把空白欄位讀成 null，不會留下 '' 的類別)
+    for column, source, default in DESCRIPTION_COLUMNS:
+        df_motorcycle[column] = df_motorcycle[source].fillna(default)
+
+    # --- 處理經緯度 (float32 就夠畫地圖，檔案也小一半) ---
+    # 注意：st.map 不接受 float32 (轉 JSON 會出錯)，app.py 畫地圖前會把抽樣的點轉回 float64
+    df_motorcycle['lat'] = lat[keep].astype('float32')
+    df_motorcycle['lon'] = lon[keep].astype('float32')
+
+    # --- 文字欄位轉成 category (Parquet 會存成 dictionary，讀回來一樣是 category) ---
+    # isin / value_counts / groupby 都改用整數 code 比較，不用再一筆一筆 hash 字串
+    for col in CATEGORY_COLUMNS:
+        df_motorcycle[col] = df_motorcycle[col].astype('category')
+
+    # --- 依發生日期、小時排序後再存檔 ---
+    # 同一個月份的資料會排在一起，app.py 篩選月份範圍時可以直接切一段連續的列
+    df_motorcycle = df_motorcycle.sort_values(['發生日期_dt', '發生小時'])
+    if not np.all(np.diff(df_motorcycle['發生月份'].to_numpy()) >= 0):
+        # 資料跨了不只一個年度時，月份不會是遞增的；app.py 會自動改用逐列比較月份 (比較慢但結果正確)
+        print("注意：資料跨年度，月份不是遞增排列，app.py 篩選月份時不會用二分搜尋。")
+
+    return df_motorcycle[OUTPUT_COLUMNS].reset_index(drop=True)
+
+
+# --- 3. 轉檔：分析一次，存成 Parquet ---
+if __name__ == "__main__":
+    raw_table = load_raw_data()
+    df_motorcycle = analyze_motorcycle_data(raw_table)
+    df_motorcycle.to_parquet(
+        OUTPUT_PARQUET,
+        engine="pyarrow",
+        compression="zstd",
+        use_dictionary=True,
+        row_group_size=200_000,
+        index=False,
+    )
+    print(f"已輸出 {OUTPUT_PARQUET}：共 {len(df_motorcycle)} 筆機車事故。")